@@ -50,54 +50,98 @@ CFspider - Cloudflare 代理 IP 池 Python 库
         - beautifulsoup4: 网页镜像
 """
 
-from .api import (
-    get, post, put, delete, head, options, patch, request,
-    clear_map_records, get_map_collector
-)
-from .session import Session
-from .cli import install_browser
-
-# IP 地图可视化
-from .ip_map import (
-    IPMapCollector, generate_map_html, add_ip_record,
-    get_collector as get_ip_collector, clear_records as clear_ip_records,
-    COLO_COORDINATES
-)
-
-# 网页镜像
-from .mirror import mirror, MirrorResult, WebMirror
+import os
+from importlib import import_module
 
-# 批量请求
+# 网页镜像 / 批量请求 / 数据导出
+# 这三个函数与所在子模块同名，必须立即导入：否则子模块被其他代码导入时，
+# 包属性会被子模块对象覆盖，导致 cfspider.batch(...) 等调用失败
+from .mirror import mirror, MirrorResult, WebMirror
 from .batch import batch, abatch, BatchResult, BatchItem
-
-# 数据导出
 from .export import export
 
-# 异步 API（基于 httpx）
-from .async_api import (
-    aget, apost, aput, adelete, ahead, aoptions, apatch,
-    arequest, astream,
-    AsyncCFSpiderResponse, AsyncStreamResponse
-)
-from .async_session import AsyncSession
-
-# TLS 指纹模拟 API（基于 curl_cffi）
-from .impersonate import (
-    impersonate_get, impersonate_post, impersonate_put,
-    impersonate_delete, impersonate_head, impersonate_options,
-    impersonate_patch, impersonate_request,
-    ImpersonateSession, ImpersonateResponse,
-    get_supported_browsers, SUPPORTED_BROWSERS
-)
-
-# 隐身模式（反爬虫规避）
-from .stealth import (
-    StealthSession,
-    get_stealth_headers, get_random_browser_headers,
-    random_delay, get_referer, update_sec_fetch_headers,
-    BROWSER_PROFILES, SUPPORTED_BROWSERS as STEALTH_BROWSERS,
-    CHROME_HEADERS, FIREFOX_HEADERS, SAFARI_HEADERS, EDGE_HEADERS, CHROME_MOBILE_HEADERS
-)
+
+# 延迟导入的公开名称：名称 -> (子模块, 属性名)
+# 首次访问时才导入对应子模块（PEP 562），避免 import cfspider 时加载
+# requests/httpx/curl_cffi 等重量级依赖
+_LAZY_IMPORTS = {
+    # 同步 API (requests)
+    "get": (".api", "get"),
+    "post": (".api", "post"),
+    "put": (".api", "put"),
+    "delete": (".api", "delete"),
+    "head": (".api", "head"),
+    "options": (".api", "options"),
+    "patch": (".api", "patch"),
+    "request": (".api", "request"),
+    "clear_map_records": (".api", "clear_map_records"),
+    "get_map_collector": (".api", "get_map_collector"),
+    "Session": (".session", "Session"),
+    "install_browser": (".cli", "install_browser"),
+    # IP 地图可视化
+    "IPMapCollector": (".ip_map", "IPMapCollector"),
+    "generate_map_html": (".ip_map", "generate_map_html"),
+    "add_ip_record": (".ip_map", "add_ip_record"),
+    "get_ip_collector": (".ip_map", "get_collector"),
+    "clear_ip_records": (".ip_map", "clear_records"),
+    "COLO_COORDINATES": (".ip_map", "COLO_COORDINATES"),
+    # 异步 API（基于 httpx）
+    "aget": (".async_api", "aget"),
+    "apost": (".async_api", "apost"),
+    "aput": (".async_api", "aput"),
+    "adelete": (".async_api", "adelete"),
+    "ahead": (".async_api", "ahead"),
+    "aoptions": (".async_api", "aoptions"),
+    "apatch": (".async_api", "apatch"),
+    "arequest": (".async_api", "arequest"),
+    "astream": (".async_api", "astream"),
+    "agather": (".async_api", "agather"),
+    "AsyncCFSpiderResponse": (".async_api", "AsyncCFSpiderResponse"),
+    "AsyncStreamResponse": (".async_api", "AsyncStreamResponse"),
+    "AsyncSession": (".async_session", "AsyncSession"),
+    # TLS 指纹模拟 API（基于 curl_cffi）
+    "impersonate_get": (".impersonate", "impersonate_get"),
+    "impersonate_post": (".impersonate", "impersonate_post"),
+    "impersonate_put": (".impersonate", "impersonate_put"),
+    "impersonate_delete": (".impersonate", "impersonate_delete"),
+    "impersonate_head": (".impersonate", "impersonate_head"),
+    "impersonate_options": (".impersonate", "impersonate_options"),
+    "impersonate_patch": (".impersonate", "impersonate_patch"),
+    "impersonate_request": (".impersonate", "impersonate_request"),
+    "ImpersonateSession": (".impersonate", "ImpersonateSession"),
+    "ImpersonateResponse": (".impersonate", "ImpersonateResponse"),
+    "get_supported_browsers": (".impersonate", "get_supported_browsers"),
+    "SUPPORTED_BROWSERS": (".impersonate", "SUPPORTED_BROWSERS"),
+    # 隐身模式（反爬虫规避）
+    "StealthSession": (".stealth", "StealthSession"),
+    "get_stealth_headers": (".stealth", "get_stealth_headers"),
+    "get_random_browser_headers": (".stealth", "get_random_browser_headers"),
+    "random_delay": (".stealth", "random_delay"),
+    "get_referer": (".stealth", "get_referer"),
+    "update_sec_fetch_headers": (".stealth", "update_sec_fetch_headers"),
+    "BROWSER_PROFILES": (".stealth", "BROWSER_PROFILES"),
+    "STEALTH_BROWSERS": (".stealth", "SUPPORTED_BROWSERS"),
+    "CHROME_HEADERS": (".stealth", "CHROME_HEADERS"),
+    "FIREFOX_HEADERS": (".stealth", "FIREFOX_HEADERS"),
+    "SAFARI_HEADERS": (".stealth", "SAFARI_HEADERS"),
+    "EDGE_HEADERS": (".stealth", "EDGE_HEADERS"),
+    "CHROME_MOBILE_HEADERS": (".stealth", "CHROME_MOBILE_HEADERS"),
+}
+
+
+def __getattr__(name):
+    """按需导入公开 API，并缓存到模块命名空间（后续访问不再经过此函数）"""
+    try:
+        module_name, attr = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 
 # 延迟导入 Browser，避免强制依赖 playwright
@@ -213,7 +257,7 @@ __all__ = [
     "CFSpiderError", "BrowserNotInstalledError", "PlaywrightNotInstalledError",
     # 异步 API (httpx)
     "aget", "apost", "aput", "adelete", "ahead", "aoptions", "apatch",
-    "arequest", "astream",
+    "arequest", "astream", "agather",
     "AsyncSession", "AsyncCFSpiderResponse", "AsyncStreamResponse",
     # TLS 指纹模拟 API (curl_cffi)
     "impersonate_get", "impersonate_post", "impersonate_put",
@@ -238,3 +282,10 @@ __all__ = [
     # 数据导出
     "export",
 ]
+
+
+# CFSPIDER_EAGER_IMPORT=1 时立即解析所有延迟导入的名称（用于 CI 中提前暴露导入错误）
+if os.environ.get("CFSPIDER_EAGER_IMPORT") == "1":
+    for _name in _LAZY_IMPORTS:
+        __getattr__(_name)
+    del _name
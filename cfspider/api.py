@@ -9,48 +9,301 @@ CFspider 核心 API 模块
 - IP 地图可视化
 """
 
-import requests
+import atexit
+import inspect
+import threading
 import time
-from urllib.parse import urlencode, quote
+import warnings
+from functools import lru_cache
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from urllib.parse import urlencode, quote_from_bytes
 from typing import Optional, Any
 
-# 延迟导入 IP 地图模块
-from . import ip_map
+# 共享会话缓存：复用连接池，避免每个请求都重新建立 TCP/TLS 连接
+_session_cache = {}
+_session_lock = threading.Lock()
 
-# 延迟导入 httpx，仅在需要 HTTP/2 时使用
-_httpx = None
+# 共享 requests 会话每个主机保留的连接数（与 httpx 默认的最大连接数一致）
+_POOL_MAXSIZE = 100
 
-def _get_httpx():
-    """延迟加载 httpx 模块"""
-    global _httpx
-    if _httpx is None:
+
+class _RejectCookiePolicy(DefaultCookiePolicy):
+    """拒绝将响应 Cookie 写入共享会话，避免不相关的请求之间互相携带 Cookie"""
+    
+    def set_ok(self, cookie, request):
+        return False
+
+
+def _create_session(backend, proxy=None, impersonate=None):
+    """
+    创建指定后端的会话对象
+    
+    各后端的库在首次创建会话时才导入，未使用的后端不会被加载。
+    """
+    if backend == "requests":
+        try:
+            import requests
+        except ImportError:
+            raise ImportError(
+                "requests is required for synchronous requests. "
+                "Install it with: pip install requests"
+            )
+        session = requests.Session()
+        session.cookies.set_policy(_RejectCookiePolicy())
+        # 会话由 batch() 等多线程调用共享，按并发量放大每个主机的连接池，
+        # 避免 urllib3 默认的 10 个连接不够用而丢弃连接
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=_POOL_MAXSIZE, pool_maxsize=_POOL_MAXSIZE
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+    
+    if backend == "httpx":
+        # 仅在需要 HTTP/2 时使用
         try:
             import httpx
-            _httpx = httpx
         except ImportError:
             raise ImportError(
                 "httpx is required for HTTP/2 support. "
                 "Install it with: pip install httpx[http2]"
             )
-    return _httpx
-
-
-# 延迟导入 curl_cffi，仅在需要 TLS 指纹时使用
-_curl_cffi = None
-
-def _get_curl_cffi():
-    """延迟加载 curl_cffi 模块"""
-    global _curl_cffi
-    if _curl_cffi is None:
+        # 共享客户端保留更多空闲连接；不保存 Cookie，因此也不默认跟随重定向
+        return httpx.Client(
+            http2=True, proxy=proxy,
+            limits=httpx.Limits(max_keepalive_connections=50),
+            cookies=CookieJar(policy=_RejectCookiePolicy())
+        )
+    
+    if backend == "curl_cffi":
+        # 仅在需要 TLS 指纹时使用
         try:
             from curl_cffi import requests as curl_requests
-            _curl_cffi = curl_requests
         except ImportError:
             raise ImportError(
                 "curl_cffi is required for TLS fingerprint impersonation. "
                 "Install it with: pip install curl_cffi"
             )
-    return _curl_cffi
+        return curl_requests.Session(impersonate=impersonate)
+    
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+class _ThreadSessions(dict):
+    """当前线程的 curl_cffi 会话（按 TLS 指纹区分，线程结束时自动关闭）"""
+    
+    def __del__(self):
+        self.close()
+    
+    def close(self):
+        sessions = list(self.values())
+        self.clear()
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+
+# 每个线程各自的 curl_cffi 会话；线程结束时随 threading.local 一起释放，
+# 避免线程池反复创建时为已退出的线程保留 CURL 句柄和连接
+_thread_local = threading.local()
+
+
+def _get_thread_session(impersonate):
+    """获取当前线程指定 TLS 指纹的 curl_cffi 会话"""
+    sessions = getattr(_thread_local, "curl_sessions", None)
+    if sessions is None:
+        sessions = _thread_local.curl_sessions = _ThreadSessions()
+    session = sessions.get(impersonate)
+    if session is None:
+        session = sessions[impersonate] = _create_session("curl_cffi", impersonate=impersonate)
+    return session
+
+
+def _get_session(backend, proxy=None, impersonate=None):
+    """
+    获取共享的会话对象（按后端和连接配置缓存）
+    
+    Args:
+        backend: 后端名称（requests / httpx / curl_cffi）
+        proxy: 代理地址，httpx 需要在创建客户端时指定
+        impersonate: TLS 指纹，curl_cffi 会话按指纹区分
+    
+    Returns:
+        requests.Session / httpx.Client / curl_cffi.requests.Session
+    """
+    if backend == "curl_cffi":
+        # curl_cffi 会话不是线程安全的，每个线程使用各自的会话
+        return _get_thread_session(impersonate)
+    
+    if backend == "httpx":
+        key = (backend, proxy)
+    else:
+        # requests 支持按请求指定代理，所有请求共用一个会话
+        key = (backend,)
+    
+    session = _session_cache.get(key)
+    if session is None:
+        with _session_lock:
+            session = _session_cache.get(key)
+            if session is None:
+                session = _create_session(backend, proxy, impersonate)
+                _session_cache[key] = session
+    return session
+
+
+def _close_sessions():
+    """关闭所有共享会话（进程退出时自动调用）"""
+    with _session_lock:
+        sessions = list(_session_cache.values())
+        _session_cache.clear()
+    for session in sessions:
+        try:
+            session.close()
+        except Exception:
+            pass
+    
+    # 主线程的 curl_cffi 会话（其他线程的会话在线程结束时已关闭）
+    thread_sessions = getattr(_thread_local, "curl_sessions", None)
+    if thread_sessions is not None:
+        thread_sessions.close()
+
+
+atexit.register(_close_sessions)
+
+
+# 地图 HTML 延迟写入：记录在请求线程中同步收集，HTML 由后台定时器合并生成，
+# 同一文件每秒最多写一次，进程退出时补写最新结果
+_MAP_FLUSH_INTERVAL = 1.0
+_pending_map_files = set()
+_map_timer = None
+_map_lock = threading.Lock()
+# 生成 HTML 期间持有，进程退出时的补写会等待正在进行的写入完成，避免文件被截断
+_map_write_lock = threading.Lock()
+
+
+def _schedule_map_output(map_file):
+    """登记待生成的地图文件，并在需要时启动后台定时器"""
+    global _map_timer
+    with _map_lock:
+        _pending_map_files.add(map_file)
+        if _map_timer is None:
+            _map_timer = threading.Timer(_MAP_FLUSH_INTERVAL, _flush_map_output)
+            _map_timer.daemon = True
+            _map_timer.start()
+
+
+def _flush_map_output():
+    """生成所有待写入的地图文件（定时器触发或进程退出时调用）"""
+    global _map_timer
+    with _map_write_lock:
+        with _map_lock:
+            map_files = list(_pending_map_files)
+            _pending_map_files.clear()
+            _map_timer = None
+        if not map_files:
+            return
+        from . import ip_map
+        for map_file in map_files:
+            try:
+                ip_map.generate_map_html(output_file=map_file)
+            except Exception as e:
+                # 写入失败时提示用户，并保留为待写入状态，由后续请求或进程退出时重试
+                warnings.warn(f"地图文件 {map_file} 生成失败: {e}", RuntimeWarning)
+                with _map_lock:
+                    _pending_map_files.add(map_file)
+
+
+atexit.register(_flush_map_output)
+
+
+@lru_cache(maxsize=256)
+def _normalize_proxy(proxy):
+    """规范化普通代理地址：未指定协议时默认使用 http://"""
+    if proxy.startswith(('http://', 'https://', 'socks5://')):
+        return proxy
+    return f"http://{proxy}"
+
+
+@lru_cache(maxsize=64)
+def _normalize_workers_base(cf_proxies):
+    """规范化 Workers 地址：去掉末尾的 /，并补全协议前缀（默认 https://）"""
+    base = cf_proxies.rstrip("/")
+    if not base.startswith(('http://', 'https://')):
+        base = f"https://{base}"
+    return base
+
+
+def _merge_query(url, params):
+    """
+    将查询参数合并到目标 URL
+    
+    与 requests 的 params 行为一致：URL 已有查询串时用 & 追加，
+    列表值展开为多个同名参数，字符串原样追加。
+    """
+    query = params if isinstance(params, str) else urlencode(params, doseq=True)
+    if not query:
+        return url
+    url, hash_mark, fragment = url.partition("#")
+    sep = "&" if "?" in url else "?"
+    return f"{url}{sep}{query}{hash_mark}{fragment}"
+
+
+@lru_cache(maxsize=1024)
+def _fast_quote(value):
+    """
+    完整百分号编码（等价于 quote(value, safe='')，按 UTF-8 编码）
+    
+    结果会被缓存：token 和重复请求的目标 URL 无需每次重新编码。
+    """
+    return quote_from_bytes(value.encode("utf-8"), safe=b"")
+
+
+def _build_workers_url(cf_proxies, url, method, params=None, token=None):
+    """
+    构建 CFspider Workers API 代理地址
+    
+    同步和异步请求共用此函数。
+    
+    Args:
+        cf_proxies: Workers 地址（可省略协议前缀，默认 https://）
+        url: 目标 URL
+        method: HTTP 方法
+        params: URL 查询参数（合并到目标 URL）
+        token: Workers API 鉴权 token
+    
+    Returns:
+        str: Workers 代理请求地址
+    """
+    target_url = url
+    if params:
+        target_url = _merge_query(url, params)
+    
+    # 构建代理 URL，添加 token 参数（如果提供）
+    proxy_url = f"{_normalize_workers_base(cf_proxies)}/proxy?url={_fast_quote(target_url)}&method={method.upper()}"
+    if token:
+        proxy_url += f"&token={_fast_quote(token)}"
+    return proxy_url
+
+
+def _prepare_workers_request(cf_proxies, url, method, params=None, headers=None,
+                             cookies=None, token=None):
+    """
+    准备 Workers API 代理请求
+    
+    自定义请求头和 Cookie 通过 X-CFSpider-Header-* 传递给 Workers。
+    
+    Returns:
+        tuple: (proxy_url, request_headers)
+    """
+    proxy_url = _build_workers_url(cf_proxies, url, method, params, token)
+    
+    request_headers = {f"X-CFSpider-Header-{k}": v for k, v in headers.items()} if headers else {}
+    if cookies:
+        request_headers["X-CFSpider-Header-Cookie"] = "; ".join(f"{k}={v}" for k, v in cookies.items())
+    
+    return proxy_url, request_headers
 
 
 class CFSpiderResponse:
@@ -86,6 +339,9 @@ class CFSpiderResponse:
         >>> print(data['origin'])        # Cloudflare IP
     """
     
+    # 不为每个实例分配 __dict__，降低大量响应对象的内存占用
+    __slots__ = ('_response', 'cf_colo', 'cf_ray', '_extractor')
+    
     def __init__(self, response, cf_colo=None, cf_ray=None):
         """
         初始化响应对象
@@ -98,6 +354,13 @@ class CFSpiderResponse:
         self._response = response
         self.cf_colo = cf_colo
         self.cf_ray = cf_ray
+        self._extractor = None
+    
+    def __getattr__(self, name):
+        """未定义的属性转发给原始响应对象（如 elapsed、http_version、iter_content）"""
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._response, name)
     
     @property
     def text(self) -> str:
@@ -167,7 +430,7 @@ class CFSpiderResponse:
     
     def _get_extractor(self):
         """获取数据提取器（延迟初始化）"""
-        if not hasattr(self, '_extractor') or self._extractor is None:
+        if self._extractor is None:
             from .extract import Extractor
             content_type = "json" if self._is_json_response() else "html"
             self._extractor = Extractor(self.text, content_type)
@@ -428,6 +691,8 @@ def request(method, url, cf_proxies=None, cf_workers=True, http2=False, imperson
                           / Whether to generate IP map HTML file (default: False)
             - True: 请求完成后生成包含代理 IP 信息的交互式地图
             - True: Generates interactive map with proxy IP information after request
+            - 地图在后台写入（每秒最多一次），进程退出前会写入最新结果
+            - Written in the background (at most once per second), flushed on exit
         map_file (str): 地图输出文件名（默认 "cfspider_map.html"）
                        / Map output filename (default: "cfspider_map.html")
         stealth (bool): 是否启用隐身模式（默认 False）
@@ -529,18 +794,15 @@ def request(method, url, cf_proxies=None, cf_workers=True, http2=False, imperson
     # 如果启用隐身模式，添加完整的浏览器请求头
     if stealth:
         from .stealth import get_stealth_headers
-        stealth_headers = get_stealth_headers(stealth_browser)
-        # 用户自定义的 headers 优先级更高
-        final_headers = stealth_headers.copy()
-        final_headers.update(headers)
-        headers = final_headers
+        # 用户自定义的 headers 优先级更高（get_stealth_headers 内部一次合并，无需再复制）
+        headers = get_stealth_headers(stealth_browser, headers)
     data = kwargs.pop("data", None)
     json_data = kwargs.pop("json", None)
     cookies = kwargs.pop("cookies", None)
     timeout = kwargs.pop("timeout", 30)
     
-    # 记录请求开始时间
-    start_time = time.time()
+    # 记录请求开始时间（仅生成地图时需要）
+    start_time = time.perf_counter_ns() if map_output else 0
     
     # 如果指定了 impersonate，使用 curl_cffi
     if impersonate:
@@ -564,9 +826,11 @@ def request(method, url, cf_proxies=None, cf_workers=True, http2=False, imperson
         _handle_map_output(response, url, start_time, map_output, map_file)
         return response
     
+    session = _get_session("requests")
+    
     # 如果没有指定 cf_proxies，直接使用 requests
     if not cf_proxies:
-        resp = requests.request(
+        resp = session.request(
             method,
             url,
             params=params,
@@ -584,16 +848,14 @@ def request(method, url, cf_proxies=None, cf_workers=True, http2=False, imperson
     # cf_workers=False：使用普通代理
     if not cf_workers:
         # 处理代理格式
-        proxy_url = cf_proxies
-        if not proxy_url.startswith(('http://', 'https://', 'socks5://')):
-            proxy_url = f"http://{proxy_url}"
+        proxy_url = _normalize_proxy(cf_proxies)
         
         proxies = {
             "http": proxy_url,
             "https": proxy_url
         }
         
-        resp = requests.request(
+        resp = session.request(
             method,
             url,
             params=params,
@@ -610,31 +872,11 @@ def request(method, url, cf_proxies=None, cf_workers=True, http2=False, imperson
         return response
     
     # cf_workers=True：使用 CFspider Workers API 代理
-    cf_proxies_url = cf_proxies.rstrip("/")
-    
-    # 确保有协议前缀
-    if not cf_proxies_url.startswith(('http://', 'https://')):
-        cf_proxies_url = f"https://{cf_proxies_url}"
-    
-    target_url = url
-    if params:
-        target_url = f"{url}?{urlencode(params)}"
-    
-    # 构建代理 URL，添加 token 参数（如果提供）
-    proxy_url = f"{cf_proxies_url}/proxy?url={quote(target_url, safe='')}&method={method.upper()}"
-    if token:
-        proxy_url += f"&token={quote(token, safe='')}"
-    
-    request_headers = {}
-    if headers:
-        for key, value in headers.items():
-            request_headers[f"X-CFSpider-Header-{key}"] = value
-    
-    if cookies:
-        cookie_str = "; ".join([f"{k}={v}" for k, v in cookies.items()])
-        request_headers["X-CFSpider-Header-Cookie"] = cookie_str
+    proxy_url, request_headers = _prepare_workers_request(
+        cf_proxies, url, method, params, headers, cookies, token
+    )
     
-    resp = requests.post(
+    resp = session.post(
         proxy_url,
         headers=request_headers,
         data=data,
@@ -657,7 +899,10 @@ def _handle_map_output(response, url, start_time, map_output, map_file):
         return
     
     # 计算响应时间
-    response_time = (time.time() - start_time) * 1000  # 毫秒
+    response_time = (time.perf_counter_ns() - start_time) / 1e6  # 毫秒
+    
+    # 延迟导入 IP 地图模块，未启用地图时不加载
+    from . import ip_map
     
     # 收集 IP 记录
     ip_map.add_ip_record(
@@ -669,101 +914,19 @@ def _handle_map_output(response, url, start_time, map_output, map_file):
         response_time=response_time
     )
     
-    # 生成地图 HTML
-    ip_map.generate_map_html(output_file=map_file)
+    # 生成地图 HTML（后台合并写入，不阻塞请求）
+    _schedule_map_output(map_file)
 
 
 def _request_impersonate(method, url, cf_proxies, cf_workers, impersonate,
                          params=None, headers=None, data=None, json_data=None,
                          cookies=None, timeout=30, token=None, **kwargs):
     """使用 curl_cffi 发送请求（支持 TLS 指纹模拟）"""
-    curl_requests = _get_curl_cffi()
-    
-    # 如果没有指定 cf_proxies，直接请求
-    if not cf_proxies:
-        response = curl_requests.request(
-            method,
-            url,
-            params=params,
-            headers=headers,
-            data=data,
-            json=json_data,
-            cookies=cookies,
-            timeout=timeout,
-            impersonate=impersonate,
-            **kwargs
-        )
-        return CFSpiderResponse(response)
-    
-    # cf_workers=False：使用普通代理
-    if not cf_workers:
-        proxy_url = cf_proxies
-        if not proxy_url.startswith(('http://', 'https://', 'socks5://')):
-            proxy_url = f"http://{proxy_url}"
-        
-        response = curl_requests.request(
-            method,
-            url,
-            params=params,
-            headers=headers,
-            data=data,
-            json=json_data,
-            cookies=cookies,
-            timeout=timeout,
-            impersonate=impersonate,
-            proxies={"http": proxy_url, "https": proxy_url},
-            **kwargs
-        )
-        return CFSpiderResponse(response)
-    
-    # cf_workers=True：使用 CFspider Workers API 代理
-    cf_proxies = cf_proxies.rstrip("/")
-    
-    if not cf_proxies.startswith(('http://', 'https://')):
-        cf_proxies = f"https://{cf_proxies}"
-    
-    target_url = url
-    if params:
-        target_url = f"{url}?{urlencode(params)}"
-    
-    proxy_url = f"{cf_proxies}/proxy?url={quote(target_url, safe='')}&method={method.upper()}"
-    if token:
-        proxy_url += f"&token={quote(token, safe='')}"
-    
-    request_headers = {}
-    if headers:
-        for key, value in headers.items():
-            request_headers[f"X-CFSpider-Header-{key}"] = value
-    
-    if cookies:
-        cookie_str = "; ".join([f"{k}={v}" for k, v in cookies.items()])
-        request_headers["X-CFSpider-Header-Cookie"] = cookie_str
-    
-    response = curl_requests.post(
-        proxy_url,
-        headers=request_headers,
-        data=data,
-        json=json_data,
-        timeout=timeout,
-        impersonate=impersonate,
-        **kwargs
-    )
-    
-    cf_colo = response.headers.get("X-CF-Colo")
-    cf_ray = response.headers.get("CF-Ray")
-    
-    return CFSpiderResponse(response, cf_colo=cf_colo, cf_ray=cf_ray)
-
-
-def _request_httpx(method, url, cf_proxies, cf_workers, params=None, headers=None,
-                   data=None, json_data=None, cookies=None, timeout=30, token=None, **kwargs):
-    """使用 httpx 发送请求（支持 HTTP/2）"""
-    httpx = _get_httpx()
-    
-    # 如果没有指定 cf_proxies，直接请求
-    if not cf_proxies:
-        with httpx.Client(http2=True, timeout=timeout) as client:
-            response = client.request(
+    session = _get_session("curl_cffi", impersonate=impersonate)
+    try:
+        # 如果没有指定 cf_proxies，直接请求
+        if not cf_proxies:
+            response = session.request(
                 method,
                 url,
                 params=params,
@@ -771,18 +934,17 @@ def _request_httpx(method, url, cf_proxies, cf_workers, params=None, headers=Non
                 data=data,
                 json=json_data,
                 cookies=cookies,
+                timeout=timeout,
+                impersonate=impersonate,
                 **kwargs
             )
             return CFSpiderResponse(response)
-    
-    # cf_workers=False：使用普通代理
-    if not cf_workers:
-        proxy_url = cf_proxies
-        if not proxy_url.startswith(('http://', 'https://', 'socks5://')):
-            proxy_url = f"http://{proxy_url}"
         
-        with httpx.Client(http2=True, timeout=timeout, proxy=proxy_url) as client:
-            response = client.request(
+        # cf_workers=False：使用普通代理
+        if not cf_workers:
+            proxy_url = _normalize_proxy(cf_proxies)
+            
+            response = session.request(
                 method,
                 url,
                 params=params,
@@ -790,364 +952,146 @@ def _request_httpx(method, url, cf_proxies, cf_workers, params=None, headers=Non
                 data=data,
                 json=json_data,
                 cookies=cookies,
+                timeout=timeout,
+                impersonate=impersonate,
+                proxies={"http": proxy_url, "https": proxy_url},
                 **kwargs
             )
             return CFSpiderResponse(response)
-    
-    # cf_workers=True：使用 CFspider Workers API 代理
-    cf_proxies = cf_proxies.rstrip("/")
-    
-    if not cf_proxies.startswith(('http://', 'https://')):
-        cf_proxies = f"https://{cf_proxies}"
-    
-    target_url = url
-    if params:
-        target_url = f"{url}?{urlencode(params)}"
-    
-    proxy_url = f"{cf_proxies}/proxy?url={quote(target_url, safe='')}&method={method.upper()}"
-    if token:
-        proxy_url += f"&token={quote(token, safe='')}"
-    
-    request_headers = {}
-    if headers:
-        for key, value in headers.items():
-            request_headers[f"X-CFSpider-Header-{key}"] = value
-    
-    if cookies:
-        cookie_str = "; ".join([f"{k}={v}" for k, v in cookies.items()])
-        request_headers["X-CFSpider-Header-Cookie"] = cookie_str
-    
-    with httpx.Client(http2=True, timeout=timeout) as client:
-        response = client.post(
+        
+        # cf_workers=True：使用 CFspider Workers API 代理
+        proxy_url, request_headers = _prepare_workers_request(
+            cf_proxies, url, method, params, headers, cookies, token
+        )
+        
+        response = session.post(
             proxy_url,
             headers=request_headers,
             data=data,
             json=json_data,
+            timeout=timeout,
+            impersonate=impersonate,
             **kwargs
         )
-    
-    cf_colo = response.headers.get("X-CF-Colo")
-    cf_ray = response.headers.get("CF-Ray")
-    
-    return CFSpiderResponse(response, cf_colo=cf_colo, cf_ray=cf_ray)
+        
+        cf_colo = response.headers.get("X-CF-Colo")
+        cf_ray = response.headers.get("CF-Ray")
+        
+        return CFSpiderResponse(response, cf_colo=cf_colo, cf_ray=cf_ray)
+    finally:
+        # 共享会话不保留 Cookie，避免不相关的请求之间互相携带
+        session.cookies.clear()
 
 
-def get(url, cf_proxies=None, cf_workers=True, http2=False, impersonate=None,
-        map_output=False, map_file="cfspider_map.html",
-        stealth=False, stealth_browser='chrome', delay=None, token=None, **kwargs):
-    """
-    发送 GET 请求 / Send GET request
-    
-    Args:
-        url (str): 目标 URL / Target URL (must include protocol, e.g., https://)
-        cf_proxies (str, optional): 代理地址 / Proxy address
-            - 当 cf_workers=True 时：CFspider Workers 地址（如 "https://your-workers.dev"）
-            - When cf_workers=True: CFspider Workers address (e.g., "https://your-workers.dev")
-            - 当 cf_workers=False 时：普通 HTTP/SOCKS5 代理（如 "http://127.0.0.1:8080"）
-            - When cf_workers=False: Regular HTTP/SOCKS5 proxy (e.g., "http://127.0.0.1:8080")
-            - 不填写时：直接请求，不使用代理 / None: Direct request without proxy
-        cf_workers (bool): 是否使用 CFspider Workers API（默认 True）
-                          / Whether to use CFspider Workers API (default: True)
-        http2 (bool): 是否启用 HTTP/2 协议（默认 False）
-                     / Whether to enable HTTP/2 protocol (default: False)
-        impersonate (str, optional): TLS 指纹模拟 / TLS fingerprint impersonation
-            - 可选值：chrome131, chrome124, safari18_0, firefox133, edge101 等
-            - Options: chrome131, chrome124, safari18_0, firefox133, edge101, etc.
-            - 设置后自动使用 curl_cffi 发送请求
-            - Automatically uses curl_cffi when set
-        map_output (bool): 是否生成 IP 地图 HTML 文件（默认 False）
-                          / Whether to generate IP map HTML file (default: False)
-        map_file (str): 地图输出文件名（默认 "cfspider_map.html"）
-                       / Map output filename (default: "cfspider_map.html")
-        stealth (bool): 是否启用隐身模式（默认 False）
-                       / Whether to enable stealth mode (default: False)
-            - True: 自动添加 15+ 个完整浏览器请求头
-            - True: Automatically adds 15+ complete browser headers
-        stealth_browser (str): 隐身模式浏览器类型（默认 'chrome'）
-                              / Stealth mode browser type (default: 'chrome')
-            - 可选值：chrome, firefox, safari, edge, chrome_mobile
-            - Options: chrome, firefox, safari, edge, chrome_mobile
-        delay (tuple, optional): 请求前随机延迟范围（秒），如 (1, 3)
-                                / Random delay range before request (seconds), e.g., (1, 3)
-        token (str, optional): Workers API 鉴权 token
-                               / Workers API authentication token
-            - 当 Workers 配置了 TOKEN 环境变量时必填
-            - Required when Workers has TOKEN environment variable configured
-        **kwargs: 其他参数，与 requests 库完全兼容
-                 / Other parameters, fully compatible with requests library
-            - params (dict): URL 查询参数 / URL query parameters
-            - headers (dict): 自定义请求头 / Custom headers
-            - data (dict/str): 表单数据 / Form data
-            - json (dict): JSON 数据 / JSON data
-            - cookies (dict): Cookie
-            - timeout (int/float): 超时时间（秒），默认 30 / Timeout (seconds), default: 30
-    
-    Returns:
-        CFSpiderResponse: 响应对象 / Response object
-            - text: 响应文本 / Response text
-            - content: 响应字节 / Response bytes
-            - json(): 解析 JSON / Parse JSON
-            - status_code: HTTP 状态码 / HTTP status code
-            - headers: 响应头 / Response headers
-            - cf_colo: Cloudflare 节点代码（使用 Workers 时可用）
-                      / Cloudflare colo code (available when using Workers)
-            - cf_ray: Cloudflare Ray ID
-    """
-    return request("GET", url, cf_proxies=cf_proxies, cf_workers=cf_workers, 
-                   http2=http2, impersonate=impersonate,
-                   map_output=map_output, map_file=map_file,
-                   stealth=stealth, stealth_browser=stealth_browser, delay=delay, token=token, **kwargs)
+def _follow_httpx_redirects(client, response, cookies=None):
+    """在共享 httpx 客户端上逐跳跟随重定向，携带请求 cookies 及各跳响应设置的 Cookie"""
+    import httpx
+    jar = httpx.Cookies(cookies)
+    history = []
+    while response.next_request is not None:
+        if len(history) >= client.max_redirects:
+            raise httpx.TooManyRedirects(
+                "Exceeded maximum allowed redirects.", request=response.next_request
+            )
+        jar.extract_cookies(response)
+        request = response.next_request
+        jar.set_cookie_header(request)
+        history.append(response)
+        response = client.send(request, follow_redirects=False)
+    response.history = history
+    return response
 
 
-def post(url, cf_proxies=None, cf_workers=True, http2=False, impersonate=None,
-         map_output=False, map_file="cfspider_map.html",
-         stealth=False, stealth_browser='chrome', delay=None, token=None, **kwargs):
-    """
-    发送 POST 请求 / Send POST request
-    
-    Args:
-        url (str): 目标 URL / Target URL (must include protocol, e.g., https://)
-        cf_proxies (str, optional): 代理地址 / Proxy address
-            - 当 cf_workers=True 时：CFspider Workers 地址（如 "https://your-workers.dev"）
-            - When cf_workers=True: CFspider Workers address (e.g., "https://your-workers.dev")
-            - 当 cf_workers=False 时：普通 HTTP/SOCKS5 代理（如 "http://127.0.0.1:8080"）
-            - When cf_workers=False: Regular HTTP/SOCKS5 proxy (e.g., "http://127.0.0.1:8080")
-            - 不填写时：直接请求，不使用代理 / None: Direct request without proxy
-        cf_workers (bool): 是否使用 CFspider Workers API（默认 True）
-                          / Whether to use CFspider Workers API (default: True)
-        http2 (bool): 是否启用 HTTP/2 协议（默认 False）
-                     / Whether to enable HTTP/2 protocol (default: False)
-        impersonate (str, optional): TLS 指纹模拟 / TLS fingerprint impersonation
-            - 可选值：chrome131, chrome124, safari18_0, firefox133, edge101 等
-            - Options: chrome131, chrome124, safari18_0, firefox133, edge101, etc.
-        map_output (bool): 是否生成 IP 地图 HTML 文件（默认 False）
-                          / Whether to generate IP map HTML file (default: False)
-        map_file (str): 地图输出文件名（默认 "cfspider_map.html"）
-                       / Map output filename (default: "cfspider_map.html")
-        stealth (bool): 是否启用隐身模式（默认 False）
-                       / Whether to enable stealth mode (default: False)
-        stealth_browser (str): 隐身模式浏览器类型（默认 'chrome'）
-                              / Stealth mode browser type (default: 'chrome')
-            - 可选值：chrome, firefox, safari, edge, chrome_mobile
-            - Options: chrome, firefox, safari, edge, chrome_mobile
-        delay (tuple, optional): 请求前随机延迟范围（秒），如 (1, 3)
-                                / Random delay range before request (seconds), e.g., (1, 3)
-        token (str, optional): Workers API 鉴权 token
-                               / Workers API authentication token
-            - 当 Workers 配置了 TOKEN 环境变量时必填
-            - Required when Workers has TOKEN environment variable configured
-        **kwargs: 其他参数，与 requests 库完全兼容
-                 / Other parameters, fully compatible with requests library
-            - data (dict/str): 表单数据 / Form data
-            - json (dict): JSON 数据 / JSON data
-            - headers (dict): 自定义请求头 / Custom headers
-            - cookies (dict): Cookie
-            - timeout (int/float): 超时时间（秒），默认 30 / Timeout (seconds), default: 30
+def _request_httpx(method, url, cf_proxies, cf_workers, params=None, headers=None,
+                   data=None, json_data=None, cookies=None, timeout=30, token=None, **kwargs):
+    """使用 httpx 发送请求（支持 HTTP/2）"""
+    # 兼容 requests 风格的 allow_redirects 参数
+    if "allow_redirects" in kwargs:
+        kwargs["follow_redirects"] = kwargs.pop("allow_redirects")
     
-    Returns:
-        CFSpiderResponse: 响应对象 / Response object
-    """
-    return request("POST", url, cf_proxies=cf_proxies, cf_workers=cf_workers,
-                   http2=http2, impersonate=impersonate,
-                   map_output=map_output, map_file=map_file,
-                   stealth=stealth, stealth_browser=stealth_browser, delay=delay, token=token, **kwargs)
-
-
-def put(url, cf_proxies=None, cf_workers=True, http2=False, impersonate=None,
-        map_output=False, map_file="cfspider_map.html",
-        stealth=False, stealth_browser='chrome', delay=None, token=None, **kwargs):
-    """
-    发送 PUT 请求 / Send PUT request
+    # 未指定 cf_proxies 时直接请求；cf_workers=False 时使用普通代理
+    if not cf_proxies or not cf_workers:
+        proxy_url = _normalize_proxy(cf_proxies) if cf_proxies else None
+        
+        # 共享客户端不保存 Cookie，而 httpx 自动跟随重定向时按客户端 Cookie 罐重建 Cookie 头，
+        # 会丢失本次请求的 cookies 和重定向响应设置的 Cookie，因此在连接池上手动跟随重定向
+        follow_redirects = kwargs.pop("follow_redirects", False)
+        client = _get_session("httpx", proxy=proxy_url)
+        response = client.request(
+            method,
+            url,
+            params=params,
+            headers=headers,
+            data=data,
+            json=json_data,
+            cookies=cookies,
+            timeout=timeout,
+            follow_redirects=False,
+            **kwargs
+        )
+        if follow_redirects and response.next_request is not None:
+            response = _follow_httpx_redirects(client, response, cookies)
+        return CFSpiderResponse(response)
     
-    Args:
-        url (str): 目标 URL / Target URL
-        cf_proxies (str, optional): 代理地址 / Proxy address
-        cf_workers (bool): 是否使用 CFspider Workers API（默认 True）
-                          / Whether to use CFspider Workers API (default: True)
-        http2 (bool): 是否启用 HTTP/2 协议（默认 False）
-                     / Whether to enable HTTP/2 protocol (default: False)
-        impersonate (str, optional): TLS 指纹模拟 / TLS fingerprint impersonation
-        map_output (bool): 是否生成 IP 地图 HTML 文件（默认 False）
-                          / Whether to generate IP map HTML file (default: False)
-        map_file (str): 地图输出文件名（默认 "cfspider_map.html"）
-                       / Map output filename (default: "cfspider_map.html")
-        stealth (bool): 是否启用隐身模式（默认 False）
-                       / Whether to enable stealth mode (default: False)
-        stealth_browser (str): 隐身模式浏览器类型（默认 'chrome'）
-                              / Stealth mode browser type (default: 'chrome')
-        delay (tuple, optional): 请求前随机延迟范围（秒），如 (1, 3)
-                                / Random delay range before request (seconds), e.g., (1, 3)
-        token (str, optional): Workers API 鉴权 token
-                               / Workers API authentication token
-        **kwargs: 其他参数，与 requests 库完全兼容
-                 / Other parameters, fully compatible with requests library
+    # cf_workers=True：使用 CFspider Workers API 代理
+    proxy_url, request_headers = _prepare_workers_request(
+        cf_proxies, url, method, params, headers, cookies, token
+    )
     
-    Returns:
-        CFSpiderResponse: 响应对象 / Response object
-    """
-    return request("PUT", url, cf_proxies=cf_proxies, cf_workers=cf_workers,
-                   http2=http2, impersonate=impersonate,
-                   map_output=map_output, map_file=map_file,
-                   stealth=stealth, stealth_browser=stealth_browser, delay=delay, token=token, **kwargs)
-
-
-def delete(url, cf_proxies=None, cf_workers=True, http2=False, impersonate=None,
-           map_output=False, map_file="cfspider_map.html",
-           stealth=False, stealth_browser='chrome', delay=None, token=None, **kwargs):
-    """
-    发送 DELETE 请求 / Send DELETE request
+    client = _get_session("httpx")
+    response = client.post(
+        proxy_url,
+        headers=request_headers,
+        data=data,
+        json=json_data,
+        timeout=timeout,
+        **kwargs
+    )
     
-    Args:
-        url (str): 目标 URL / Target URL
-        cf_proxies (str, optional): 代理地址 / Proxy address
-        cf_workers (bool): 是否使用 CFspider Workers API（默认 True）
-                          / Whether to use CFspider Workers API (default: True)
-        http2 (bool): 是否启用 HTTP/2 协议（默认 False）
-                     / Whether to enable HTTP/2 protocol (default: False)
-        impersonate (str, optional): TLS 指纹模拟 / TLS fingerprint impersonation
-        map_output (bool): 是否生成 IP 地图 HTML 文件（默认 False）
-                          / Whether to generate IP map HTML file (default: False)
-        map_file (str): 地图输出文件名（默认 "cfspider_map.html"）
-                       / Map output filename (default: "cfspider_map.html")
-        stealth (bool): 是否启用隐身模式（默认 False）
-                       / Whether to enable stealth mode (default: False)
-        stealth_browser (str): 隐身模式浏览器类型（默认 'chrome'）
-                              / Stealth mode browser type (default: 'chrome')
-        delay (tuple, optional): 请求前随机延迟范围（秒），如 (1, 3)
-                                / Random delay range before request (seconds), e.g., (1, 3)
-        token (str, optional): Workers API 鉴权 token
-                               / Workers API authentication token
-        **kwargs: 其他参数，与 requests 库完全兼容
-                 / Other parameters, fully compatible with requests library
+    cf_colo = response.headers.get("X-CF-Colo")
+    cf_ray = response.headers.get("CF-Ray")
     
-    Returns:
-        CFSpiderResponse: 响应对象 / Response object
-    """
-    return request("DELETE", url, cf_proxies=cf_proxies, cf_workers=cf_workers,
-                   http2=http2, impersonate=impersonate,
-                   map_output=map_output, map_file=map_file,
-                   stealth=stealth, stealth_browser=stealth_browser, delay=delay, token=token, **kwargs)
+    return CFSpiderResponse(response, cf_colo=cf_colo, cf_ray=cf_ray)
 
 
-def head(url, cf_proxies=None, cf_workers=True, http2=False, impersonate=None,
-         map_output=False, map_file="cfspider_map.html",
-         stealth=False, stealth_browser='chrome', delay=None, token=None, **kwargs):
-    """
-    发送 HEAD 请求 / Send HEAD request
-    
-    Args:
-        url (str): 目标 URL / Target URL
-        cf_proxies (str, optional): 代理地址 / Proxy address
-        cf_workers (bool): 是否使用 CFspider Workers API（默认 True）
-                          / Whether to use CFspider Workers API (default: True)
-        http2 (bool): 是否启用 HTTP/2 协议（默认 False）
-                     / Whether to enable HTTP/2 protocol (default: False)
-        impersonate (str, optional): TLS 指纹模拟 / TLS fingerprint impersonation
-        map_output (bool): 是否生成 IP 地图 HTML 文件（默认 False）
-                          / Whether to generate IP map HTML file (default: False)
-        map_file (str): 地图输出文件名（默认 "cfspider_map.html"）
-                       / Map output filename (default: "cfspider_map.html")
-        stealth (bool): 是否启用隐身模式（默认 False）
-                       / Whether to enable stealth mode (default: False)
-        stealth_browser (str): 隐身模式浏览器类型（默认 'chrome'）
-                              / Stealth mode browser type (default: 'chrome')
-        delay (tuple, optional): 请求前随机延迟范围（秒），如 (1, 3)
-                                / Random delay range before request (seconds), e.g., (1, 3)
-        token (str, optional): Workers API 鉴权 token
-                               / Workers API authentication token
-        **kwargs: 其他参数，与 requests 库完全兼容
-                 / Other parameters, fully compatible with requests library
-    
-    Returns:
-        CFSpiderResponse: 响应对象 / Response object
-    """
-    return request("HEAD", url, cf_proxies=cf_proxies, cf_workers=cf_workers,
-                   http2=http2, impersonate=impersonate,
-                   map_output=map_output, map_file=map_file,
-                   stealth=stealth, stealth_browser=stealth_browser, delay=delay, token=token, **kwargs)
+# request() 去掉 method 参数后的签名，供 get/post 等便捷函数的 help() 显示
+_VERB_SIGNATURE = inspect.signature(request).replace(
+    parameters=list(inspect.signature(request).parameters.values())[1:]
+)
 
 
-def options(url, cf_proxies=None, cf_workers=True, http2=False, impersonate=None,
-            map_output=False, map_file="cfspider_map.html",
-            stealth=False, stealth_browser='chrome', delay=None, token=None, **kwargs):
-    """
-    发送 OPTIONS 请求 / Send OPTIONS request
+def _make_verb(method):
+    """生成指定 HTTP 方法的便捷请求函数（get/post/put 等）"""
+    def verb(url, *args, **kwargs):
+        return request(method, url, *args, **kwargs)
     
-    Args:
-        url (str): 目标 URL / Target URL
-        cf_proxies (str, optional): 代理地址 / Proxy address
-        cf_workers (bool): 是否使用 CFspider Workers API（默认 True）
-                          / Whether to use CFspider Workers API (default: True)
-        http2 (bool): 是否启用 HTTP/2 协议（默认 False）
-                     / Whether to enable HTTP/2 protocol (default: False)
-        impersonate (str, optional): TLS 指纹模拟 / TLS fingerprint impersonation
-        map_output (bool): 是否生成 IP 地图 HTML 文件（默认 False）
-                          / Whether to generate IP map HTML file (default: False)
-        map_file (str): 地图输出文件名（默认 "cfspider_map.html"）
-                       / Map output filename (default: "cfspider_map.html")
-        stealth (bool): 是否启用隐身模式（默认 False）
-                       / Whether to enable stealth mode (default: False)
-        stealth_browser (str): 隐身模式浏览器类型（默认 'chrome'）
-                              / Stealth mode browser type (default: 'chrome')
-        delay (tuple, optional): 请求前随机延迟范围（秒），如 (1, 3)
-                                / Random delay range before request (seconds), e.g., (1, 3)
-        token (str, optional): Workers API 鉴权 token
-                               / Workers API authentication token
-        **kwargs: 其他参数，与 requests 库完全兼容
-                 / Other parameters, fully compatible with requests library
+    verb.__name__ = verb.__qualname__ = method.lower()
+    verb.__signature__ = _VERB_SIGNATURE
+    verb.__doc__ = f"""
+    发送 {method} 请求 / Send {method} request
+    
+    参数与 cfspider.request() 相同（不含 method），详见 request() 的文档。
+    Same parameters as cfspider.request() (without method), see request() for details.
     
     Returns:
         CFSpiderResponse: 响应对象 / Response object
     """
-    return request("OPTIONS", url, cf_proxies=cf_proxies, cf_workers=cf_workers,
-                   http2=http2, impersonate=impersonate,
-                   map_output=map_output, map_file=map_file,
-                   stealth=stealth, stealth_browser=stealth_browser, delay=delay, token=token, **kwargs)
+    return verb
 
 
-def patch(url, cf_proxies=None, cf_workers=True, http2=False, impersonate=None,
-          map_output=False, map_file="cfspider_map.html",
-          stealth=False, stealth_browser='chrome', delay=None, token=None, **kwargs):
-    """
-    发送 PATCH 请求 / Send PATCH request
-    
-    Args:
-        url (str): 目标 URL / Target URL
-        cf_proxies (str, optional): 代理地址 / Proxy address
-        cf_workers (bool): 是否使用 CFspider Workers API（默认 True）
-                          / Whether to use CFspider Workers API (default: True)
-        http2 (bool): 是否启用 HTTP/2 协议（默认 False）
-                     / Whether to enable HTTP/2 protocol (default: False)
-        impersonate (str, optional): TLS 指纹模拟 / TLS fingerprint impersonation
-        map_output (bool): 是否生成 IP 地图 HTML 文件（默认 False）
-                          / Whether to generate IP map HTML file (default: False)
-        map_file (str): 地图输出文件名（默认 "cfspider_map.html"）
-                       / Map output filename (default: "cfspider_map.html")
-        stealth (bool): 是否启用隐身模式（默认 False）
-                       / Whether to enable stealth mode (default: False)
-        stealth_browser (str): 隐身模式浏览器类型（默认 'chrome'）
-                              / Stealth mode browser type (default: 'chrome')
-        delay (tuple, optional): 请求前随机延迟范围（秒），如 (1, 3)
-                                / Random delay range before request (seconds), e.g., (1, 3)
-        token (str, optional): Workers API 鉴权 token
-                               / Workers API authentication token
-        **kwargs: 其他参数，与 requests 库完全兼容
-                 / Other parameters, fully compatible with requests library
-    
-    Returns:
-        CFSpiderResponse: 响应对象 / Response object
-    """
-    return request("PATCH", url, cf_proxies=cf_proxies, cf_workers=cf_workers,
-                   http2=http2, impersonate=impersonate,
-                   map_output=map_output, map_file=map_file,
-                   stealth=stealth, stealth_browser=stealth_browser, delay=delay, token=token, **kwargs)
+get, post, put, delete, head, options, patch = (
+    _make_verb(method)
+    for method in ("GET", "POST", "PUT", "DELETE", "HEAD", "OPTIONS", "PATCH")
+)
 
 
 def clear_map_records():
     """清空 IP 地图记录"""
+    from . import ip_map
     ip_map.clear_records()
 
 
 def get_map_collector():
     """获取 IP 地图收集器"""
+    from . import ip_map
     return ip_map.get_collector()
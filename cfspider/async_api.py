@@ -30,11 +30,13 @@ CFspider 异步 API 模块
     - 同步请求 10 个 URL：约 10 秒（串行）
     - 异步请求 10 个 URL：约 1 秒（并发）
 """
+import asyncio
 import httpx
-from urllib.parse import urlencode, quote
-from typing import Optional, Dict, Any, AsyncIterator
+from typing import Optional, Dict, Any, AsyncIterator, List, Union
 from contextlib import asynccontextmanager
 
+from .api import _normalize_proxy, _prepare_workers_request
+
 
 class AsyncCFSpiderResponse:
     """
@@ -267,6 +269,29 @@ async def arequest(
     Returns:
         AsyncCFSpiderResponse: 异步响应对象
     """
+    # cf_workers=False：普通代理需要在创建客户端时指定
+    proxy_url = None
+    if cf_proxies and not cf_workers:
+        proxy_url = _normalize_proxy(cf_proxies)
+    
+    async with httpx.AsyncClient(http2=http2, proxy=proxy_url) as client:
+        return await _asend(client, method, url, cf_proxies, cf_workers, token, **kwargs)
+
+
+async def _asend(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    cf_proxies: Optional[str] = None,
+    cf_workers: bool = True,
+    token: Optional[str] = None,
+    **kwargs
+) -> AsyncCFSpiderResponse:
+    """
+    使用已创建的 AsyncClient 发送请求
+    
+    cf_workers=False 时，client 需已配置对应的普通代理。
+    """
     params = kwargs.pop("params", None)
     headers = kwargs.pop("headers", {})
     data = kwargs.pop("data", None)
@@ -274,71 +299,34 @@ async def arequest(
     cookies = kwargs.pop("cookies", None)
     timeout = kwargs.pop("timeout", 30)
     
-    # 如果没有指定 cf_proxies，直接请求
-    if not cf_proxies:
-        async with httpx.AsyncClient(http2=http2, timeout=timeout) as client:
-            response = await client.request(
-                method,
-                url,
-                params=params,
-                headers=headers,
-                data=data,
-                json=json_data,
-                cookies=cookies,
-                **kwargs
-            )
-            return AsyncCFSpiderResponse(response)
-    
-    # cf_workers=False：使用普通代理
-    if not cf_workers:
-        proxy_url = cf_proxies
-        if not proxy_url.startswith(('http://', 'https://', 'socks5://')):
-            proxy_url = f"http://{proxy_url}"
-        
-        async with httpx.AsyncClient(http2=http2, timeout=timeout, proxy=proxy_url) as client:
-            response = await client.request(
-                method,
-                url,
-                params=params,
-                headers=headers,
-                data=data,
-                json=json_data,
-                cookies=cookies,
-                **kwargs
-            )
-            return AsyncCFSpiderResponse(response)
-    
-    # cf_workers=True：使用 CFspider Workers API 代理
-    cf_proxies = cf_proxies.rstrip("/")
-    
-    if not cf_proxies.startswith(('http://', 'https://')):
-        cf_proxies = f"https://{cf_proxies}"
-    
-    target_url = url
-    if params:
-        target_url = f"{url}?{urlencode(params)}"
-    
-    proxy_url = f"{cf_proxies}/proxy?url={quote(target_url, safe='')}&method={method.upper()}"
-    if token:
-        proxy_url += f"&token={quote(token, safe='')}"
-    
-    request_headers = {}
-    if headers:
-        for key, value in headers.items():
-            request_headers[f"X-CFSpider-Header-{key}"] = value
-    
-    if cookies:
-        cookie_str = "; ".join([f"{k}={v}" for k, v in cookies.items()])
-        request_headers["X-CFSpider-Header-Cookie"] = cookie_str
-    
-    async with httpx.AsyncClient(http2=http2, timeout=timeout) as client:
-        response = await client.post(
-            proxy_url,
-            headers=request_headers,
+    # 如果没有指定 cf_proxies 或使用普通代理，直接请求
+    if not cf_proxies or not cf_workers:
+        response = await client.request(
+            method,
+            url,
+            params=params,
+            headers=headers,
             data=data,
             json=json_data,
+            cookies=cookies,
+            timeout=timeout,
             **kwargs
         )
+        return AsyncCFSpiderResponse(response)
+    
+    # cf_workers=True：使用 CFspider Workers API 代理
+    proxy_url, request_headers = _prepare_workers_request(
+        cf_proxies, url, method, params, headers, cookies, token
+    )
+    
+    response = await client.post(
+        proxy_url,
+        headers=request_headers,
+        data=data,
+        json=json_data,
+        timeout=timeout,
+        **kwargs
+    )
     
     cf_colo = response.headers.get("X-CF-Colo")
     cf_ray = response.headers.get("CF-Ray")
@@ -346,6 +334,92 @@ async def arequest(
     return AsyncCFSpiderResponse(response, cf_colo=cf_colo, cf_ray=cf_ray)
 
 
+async def agather(
+    requests: List[Union[str, Dict[str, Any]]],
+    concurrency: int = 16,
+    cf_proxies: Optional[str] = None,
+    cf_workers: bool = True,
+    http2: bool = True,
+    token: Optional[str] = None,
+    return_exceptions: bool = False,
+    **kwargs
+) -> List[AsyncCFSpiderResponse]:
+    """
+    并发发送多个异步请求，所有请求共用一个 AsyncClient（复用连接池）
+    
+    Args:
+        requests: 请求列表，每项可以是：
+                  - URL 字符串（GET 请求）
+                  - 字典，包含 url、method（默认 GET）及其他请求参数
+        concurrency: 最大并发数（默认 16）
+        cf_proxies: 代理地址（选填），对所有请求生效
+        cf_workers: 是否使用 CFspider Workers API（默认 True）
+        http2: 是否启用 HTTP/2（默认 True）
+        token: Workers API 鉴权 token
+        return_exceptions: 为 True 时失败的请求返回异常对象而不是直接抛出
+        **kwargs: 所有请求共用的默认参数（可被单个请求覆盖）
+    
+    单个请求可以覆盖 token、cf_proxies、cf_workers；由于所有请求共用一个客户端，
+    http2 以及普通代理（cf_workers=False）地址不能按请求变化，否则抛出 ValueError。
+    
+    Returns:
+        List[AsyncCFSpiderResponse]: 与 requests 顺序一致的响应列表
+    
+    Example:
+        >>> responses = await cfspider.agather([
+        ...     "https://httpbin.org/ip",
+        ...     {"method": "POST", "url": "https://httpbin.org/post", "json": {"a": 1}},
+        ... ], cf_proxies="https://your-workers.dev")
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    # cf_workers=False：普通代理需要在创建客户端时指定
+    proxy_url = None
+    if cf_proxies and not cf_workers:
+        proxy_url = _normalize_proxy(cf_proxies)
+    
+    # 先展开所有请求参数，在发出任何请求前检查共用客户端无法满足的设置
+    jobs = []
+    for spec in requests:
+        if isinstance(spec, str):
+            spec = {"url": spec}
+        if "http2" in spec:
+            raise ValueError(
+                "agather() 的请求共用一个客户端，不能单独设置 http2，"
+                "请使用 agather(..., http2=...)"
+            )
+        options = {**kwargs, **spec}
+        method = options.pop("method", "GET")
+        url = options.pop("url")
+        item_proxies = options.pop("cf_proxies", cf_proxies)
+        item_workers = options.pop("cf_workers", cf_workers)
+        item_token = options.pop("token", token)
+        item_proxy_url = None
+        if item_proxies and not item_workers:
+            item_proxy_url = _normalize_proxy(item_proxies)
+        if item_proxy_url != proxy_url:
+            raise ValueError(
+                f"agather() 的请求共用一个客户端，普通代理（cf_workers=False）不能按请求变化: {url}"
+            )
+        jobs.append((method, url, item_proxies, item_workers, item_token, options))
+    
+    async with httpx.AsyncClient(http2=http2, proxy=proxy_url) as client:
+        async def send(job):
+            method, url, item_proxies, item_workers, item_token, options = job
+            async with semaphore:
+                return await _asend(client, method, url, item_proxies, item_workers, item_token, **options)
+        
+        tasks = [asyncio.ensure_future(send(job)) for job in jobs]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        except BaseException:
+            # 有请求失败时先取消其余请求，避免客户端关闭后它们仍在运行
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+
 @asynccontextmanager
 async def astream(
     method: str,
@@ -400,9 +474,7 @@ async def astream(
     
     # cf_workers=False：使用普通代理
     if not cf_workers:
-        proxy_url = cf_proxies
-        if not proxy_url.startswith(('http://', 'https://', 'socks5://')):
-            proxy_url = f"http://{proxy_url}"
+        proxy_url = _normalize_proxy(cf_proxies)
         
         async with httpx.AsyncClient(http2=http2, timeout=timeout, proxy=proxy_url) as client:
             async with client.stream(
@@ -419,27 +491,9 @@ async def astream(
         return
     
     # cf_workers=True：使用 CFspider Workers API 代理
-    cf_proxies_url = cf_proxies.rstrip("/")
-    
-    if not cf_proxies_url.startswith(('http://', 'https://')):
-        cf_proxies_url = f"https://{cf_proxies_url}"
-    
-    target_url = url
-    if params:
-        target_url = f"{url}?{urlencode(params)}"
-    
-    proxy_endpoint = f"{cf_proxies_url}/proxy?url={quote(target_url, safe='')}&method={method.upper()}"
-    if token:
-        proxy_endpoint += f"&token={quote(token, safe='')}"
-    
-    request_headers = {}
-    if headers:
-        for key, value in headers.items():
-            request_headers[f"X-CFSpider-Header-{key}"] = value
-    
-    if cookies:
-        cookie_str = "; ".join([f"{k}={v}" for k, v in cookies.items()])
-        request_headers["X-CFSpider-Header-Cookie"] = cookie_str
+    proxy_endpoint, request_headers = _prepare_workers_request(
+        cf_proxies, url, method, params, headers, cookies, token
+    )
     
     async with httpx.AsyncClient(http2=http2, timeout=timeout) as client:
         async with client.stream(
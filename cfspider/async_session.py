@@ -4,10 +4,10 @@ CFspider 异步会话模块
 基于 httpx 实现，提供可复用的异步 HTTP 客户端，支持 HTTP/2 和连接池。
 """
 import httpx
-from urllib.parse import urlencode, quote
 from typing import Optional, Dict, Any, AsyncIterator
 from contextlib import asynccontextmanager
 
+from .api import _normalize_proxy, _prepare_workers_request
 from .async_api import AsyncCFSpiderResponse, AsyncStreamResponse
 
 
@@ -70,9 +70,7 @@ class AsyncSession:
             # 处理代理
             proxy = None
             if self.cf_proxies and not self.cf_workers:
-                proxy = self.cf_proxies
-                if not proxy.startswith(('http://', 'https://', 'socks5://')):
-                    proxy = f"http://{proxy}"
+                proxy = _normalize_proxy(self.cf_proxies)
             
             self._client = httpx.AsyncClient(
                 http2=self.http2,
@@ -134,27 +132,10 @@ class AsyncSession:
             return AsyncCFSpiderResponse(response)
         
         # 使用 CFspider Workers API 代理
-        cf_proxies_url = self.cf_proxies.rstrip("/")
-        
-        if not cf_proxies_url.startswith(('http://', 'https://')):
-            cf_proxies_url = f"https://{cf_proxies_url}"
-        
-        target_url = url
-        if params:
-            target_url = f"{url}?{urlencode(params)}"
-        
-        proxy_url = f"{cf_proxies_url}/proxy?url={quote(target_url, safe='')}&method={method.upper()}"
-        if self.token:
-            proxy_url += f"&token={quote(self.token, safe='')}"
-        
-        request_headers = {}
-        for key, value in merged_headers.items():
-            request_headers[f"X-CFSpider-Header-{key}"] = value
-        
         all_cookies = {**self.cookies, **(cookies or {})}
-        if all_cookies:
-            cookie_str = "; ".join([f"{k}={v}" for k, v in all_cookies.items()])
-            request_headers["X-CFSpider-Header-Cookie"] = cookie_str
+        proxy_url, request_headers = _prepare_workers_request(
+            self.cf_proxies, url, method, params, merged_headers, all_cookies, self.token
+        )
         
         response = await self._client.post(
             proxy_url,
@@ -216,27 +197,10 @@ class AsyncSession:
             return
         
         # 使用 CFspider Workers API 代理
-        cf_proxies_url = self.cf_proxies.rstrip("/")
-        
-        if not cf_proxies_url.startswith(('http://', 'https://')):
-            cf_proxies_url = f"https://{cf_proxies_url}"
-        
-        target_url = url
-        if params:
-            target_url = f"{url}?{urlencode(params)}"
-        
-        proxy_url = f"{cf_proxies_url}/proxy?url={quote(target_url, safe='')}&method={method.upper()}"
-        if self.token:
-            proxy_url += f"&token={quote(self.token, safe='')}"
-        
-        request_headers = {}
-        for key, value in merged_headers.items():
-            request_headers[f"X-CFSpider-Header-{key}"] = value
-        
         all_cookies = {**self.cookies, **(cookies or {})}
-        if all_cookies:
-            cookie_str = "; ".join([f"{k}={v}" for k, v in all_cookies.items()])
-            request_headers["X-CFSpider-Header-Cookie"] = cookie_str
+        proxy_url, request_headers = _prepare_workers_request(
+            self.cf_proxies, url, method, params, merged_headers, all_cookies, self.token
+        )
         
         async with self._client.stream(
             "POST",
@@ -334,7 +334,8 @@ def export_sqlite(data: Union[Dict, List[Dict]],
     
     # 插入数据
     placeholders = ", ".join(["?" for _ in fieldnames])
-    insert_sql = f"INSERT INTO {table} ({', '.join([f'\"{n}\"' for n in fieldnames])}) VALUES ({placeholders})"
+    column_names = ", ".join([f'"{n}"' for n in fieldnames])
+    insert_sql = f"INSERT INTO {table} ({column_names}) VALUES ({placeholders})"
     
     for row in rows:
         if isinstance(row, dict):
@@ -3,9 +3,10 @@ CFspider TLS 指纹模拟模块
 
 基于 curl_cffi 实现，可模拟各种浏览器的 TLS 指纹，绕过反爬检测。
 """
-from urllib.parse import urlencode, quote
 from typing import Optional, Dict, Any, List
 
+from .api import _normalize_proxy, _prepare_workers_request
+
 # 延迟导入 curl_cffi
 _curl_cffi = None
 
@@ -142,9 +143,7 @@ def impersonate_request(
     
     # cf_workers=False：使用普通代理
     if not cf_workers:
-        proxy_url = cf_proxies
-        if not proxy_url.startswith(('http://', 'https://', 'socks5://')):
-            proxy_url = f"http://{proxy_url}"
+        proxy_url = _normalize_proxy(cf_proxies)
         
         response = curl_requests.request(
             method,
@@ -162,27 +161,9 @@ def impersonate_request(
         return ImpersonateResponse(response)
     
     # cf_workers=True：使用 CFspider Workers API 代理
-    cf_proxies = cf_proxies.rstrip("/")
-    
-    if not cf_proxies.startswith(('http://', 'https://')):
-        cf_proxies = f"https://{cf_proxies}"
-    
-    target_url = url
-    if params:
-        target_url = f"{url}?{urlencode(params)}"
-    
-    proxy_url = f"{cf_proxies}/proxy?url={quote(target_url, safe='')}&method={method.upper()}"
-    if token:
-        proxy_url += f"&token={quote(token, safe='')}"
-    
-    request_headers = {}
-    if headers:
-        for key, value in headers.items():
-            request_headers[f"X-CFSpider-Header-{key}"] = value
-    
-    if cookies:
-        cookie_str = "; ".join([f"{k}={v}" for k, v in cookies.items()])
-        request_headers["X-CFSpider-Header-Cookie"] = cookie_str
+    proxy_url, request_headers = _prepare_workers_request(
+        cf_proxies, url, method, params, headers, cookies, token
+    )
     
     response = curl_requests.post(
         proxy_url,
@@ -304,9 +285,7 @@ class ImpersonateSession:
         if not self.cf_proxies or not self.cf_workers:
             proxies = None
             if self.cf_proxies and not self.cf_workers:
-                proxy_url = self.cf_proxies
-                if not proxy_url.startswith(('http://', 'https://', 'socks5://')):
-                    proxy_url = f"http://{proxy_url}"
+                proxy_url = _normalize_proxy(self.cf_proxies)
                 proxies = {"http": proxy_url, "https": proxy_url}
             
             response = self._session.request(
@@ -321,25 +300,10 @@ class ImpersonateSession:
             return ImpersonateResponse(response)
         
         # 使用 CFspider Workers API 代理
-        cf_proxies_url = self.cf_proxies.rstrip("/")
-        
-        if not cf_proxies_url.startswith(('http://', 'https://')):
-            cf_proxies_url = f"https://{cf_proxies_url}"
-        
         params = kwargs.pop("params", None)
-        target_url = url
-        if params:
-            target_url = f"{url}?{urlencode(params)}"
-        
-        proxy_url = f"{cf_proxies_url}/proxy?url={quote(target_url, safe='')}&method={method.upper()}"
-        
-        request_headers = {}
-        for key, value in merged_headers.items():
-            request_headers[f"X-CFSpider-Header-{key}"] = value
-        
-        if merged_cookies:
-            cookie_str = "; ".join([f"{k}={v}" for k, v in merged_cookies.items()])
-            request_headers["X-CFSpider-Header-Cookie"] = cookie_str
+        proxy_url, request_headers = _prepare_workers_request(
+            self.cf_proxies, url, method, params, merged_headers, merged_cookies
+        )
         
         response = self._session.post(
             proxy_url,
@@ -106,11 +106,9 @@ class Session:
             但请求级别的参数优先级更高。
             but request-level parameters have higher priority.
         """
-        headers = self.headers.copy()
-        headers.update(kwargs.pop("headers", {}))
-        
-        cookies = self.cookies.copy()
-        cookies.update(kwargs.pop("cookies", {}))
+        # 请求级别的参数覆盖会话级别的参数
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        cookies = {**self.cookies, **kwargs.pop("cookies", {})}
         
         return request(
             method,
@@ -3,6 +3,8 @@ CFspider 内置 VLESS 客户端
 通过 WebSocket 连接 edgetunnel，提供本地 HTTP 代理
 """
 
+import base64
+import os
 import socket
 import struct
 import threading
@@ -12,6 +14,90 @@ import uuid
 from urllib.parse import urlparse
 
 
+# 预编译的 WebSocket 帧头格式（首字节、长度字节、扩展长度、4 字节掩码）
+_WS_HEADER = struct.Struct('>BB4s')
+_WS_HEADER_16 = struct.Struct('>BBH4s')
+_WS_HEADER_64 = struct.Struct('>BBQ4s')
+_UINT16 = struct.Struct('>H')
+_UINT64 = struct.Struct('>Q')
+
+
+def _recv_exact(sock, size):
+    """
+    读取固定长度的数据（帧头、扩展长度、掩码）
+    
+    单次 recv 可能只返回部分字节，循环读取直到满足长度；
+    连接关闭时返回已读到的部分。
+    """
+    data = sock.recv(size)
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def _xor_mask(data, mask):
+    """
+    WebSocket 掩码运算（4 字节掩码循环异或，掩码和去掩码相同）
+    
+    将数据和平铺后的掩码各转为一个大整数做一次异或，
+    由 C 实现完成，避免逐字节的 Python 循环。
+    """
+    length = len(data)
+    if not length:
+        return b''
+    key = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(key, 'big')).to_bytes(length, 'big')
+
+
+def _response_status(head):
+    """解析响应头中的状态码，无法解析时返回 None"""
+    parts = head.split(b'\r\n', 1)[0].split(b' ', 2)
+    if len(parts) > 1 and parts[1].isdigit():
+        return int(parts[1])
+    return None
+
+
+def _is_interim_response(head):
+    """是否为 1xx 临时响应（如 100 Continue、103 Early Hints），其后还有最终响应"""
+    status = _response_status(head)
+    return status is not None and 100 <= status < 200 and status != 101
+
+
+def _response_body_length(head, method):
+    """
+    根据最终响应头确定正文长度
+    
+    Returns:
+        int: 正文字节数；None 表示长度未知（chunked、以关闭连接结束或无法解析）
+    """
+    status = _response_status(head)
+    if status is None:
+        return None
+    
+    # HEAD 响应以及 204/304 没有正文
+    if method == 'HEAD' or status in (204, 304):
+        return 0
+    
+    # 101 切换协议后为双向数据流，长度未知
+    if status < 200:
+        return None
+    
+    content_length = None
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        name = name.strip().lower()
+        if name == b'transfer-encoding':
+            return None
+        if name == b'content-length':
+            value = value.strip()
+            if value.isdigit():
+                content_length = int(value)
+    return content_length
+
+
 class VlessClient:
     """VLESS 协议客户端"""
     
@@ -31,24 +117,16 @@ class VlessClient:
         self.port = parsed.port or (443 if parsed.scheme == 'wss' else 80)
         self.path = parsed.path or '/'
         self.use_ssl = parsed.scheme == 'wss'
+        
+        # VLESS 头的固定前缀：协议版本 + UUID (16 bytes) + 附加信息长度 + 命令 (1 = TCP)
+        self._header_prefix = b'\x00' + uuid.UUID(self.vless_uuid).bytes + b'\x00\x01'
     
     def _create_vless_header(self, target_host, target_port):
         """创建 VLESS 请求头"""
-        # VLESS 协议版本
-        header = bytes([0])
-        
-        # UUID (16 bytes)
-        uuid_bytes = uuid.UUID(self.vless_uuid).bytes
-        header += uuid_bytes
-        
-        # 附加信息长度
-        header += bytes([0])
-        
-        # 命令 (1 = TCP)
-        header += bytes([1])
+        header = self._header_prefix
         
         # 目标端口
-        header += struct.pack('>H', target_port)
+        header += _UINT16.pack(target_port)
         
         # 地址类型和地址
         try:
@@ -73,10 +151,6 @@ class VlessClient:
     
     def _websocket_handshake(self, sock):
         """执行 WebSocket 握手"""
-        import base64
-        import hashlib
-        import os
-        
         # 生成随机 key
         key = base64.b64encode(os.urandom(16)).decode('utf-8')
         
@@ -108,35 +182,24 @@ class VlessClient:
     
     def _send_ws_frame(self, sock, data):
         """发送 WebSocket 帧"""
-        import os
-        
-        # 构建帧头
-        frame = bytes([0x82])  # Binary frame, FIN=1
+        # 掩码
+        mask = os.urandom(4)
         
+        # 构建帧头：Binary frame, FIN=1，负载带掩码
         length = len(data)
         if length <= 125:
-            frame += bytes([0x80 | length])  # Masked
+            header = _WS_HEADER.pack(0x82, 0x80 | length, mask)
         elif length <= 65535:
-            frame += bytes([0x80 | 126])
-            frame += struct.pack('>H', length)
+            header = _WS_HEADER_16.pack(0x82, 0x80 | 126, length, mask)
         else:
-            frame += bytes([0x80 | 127])
-            frame += struct.pack('>Q', length)
+            header = _WS_HEADER_64.pack(0x82, 0x80 | 127, length, mask)
         
-        # 掩码
-        mask = os.urandom(4)
-        frame += mask
-        
-        # 掩码数据
-        masked_data = bytes([data[i] ^ mask[i % 4] for i in range(len(data))])
-        frame += masked_data
-        
-        sock.sendall(frame)
+        sock.sendall(header + _xor_mask(data, mask))
     
     def _recv_ws_frame(self, sock):
         """接收 WebSocket 帧"""
         # 读取帧头
-        header = sock.recv(2)
+        header = _recv_exact(sock, 2)
         if len(header) < 2:
             return None
         
@@ -145,25 +208,24 @@ class VlessClient:
         length = header[1] & 0x7F
         
         if length == 126:
-            length_bytes = sock.recv(2)
-            length = struct.unpack('>H', length_bytes)[0]
+            length_bytes = _recv_exact(sock, 2)
+            length = _UINT16.unpack(length_bytes)[0]
         elif length == 127:
-            length_bytes = sock.recv(8)
-            length = struct.unpack('>Q', length_bytes)[0]
+            length_bytes = _recv_exact(sock, 8)
+            length = _UINT64.unpack(length_bytes)[0]
         
         if masked:
-            mask = sock.recv(4)
+            mask = _recv_exact(sock, 4)
         
-        # 读取数据
-        data = b''
+        # 读取数据（bytearray 追加为均摊 O(1)，避免 bytes 拼接的反复复制）
+        data = bytearray()
         while len(data) < length:
             chunk = sock.recv(length - len(data))
             if not chunk:
                 break
             data += chunk
         
-        if masked:
-            data = bytes([data[i] ^ mask[i % 4] for i in range(len(data))])
+        data = _xor_mask(data, mask) if masked else bytes(data)
         
         # 处理关闭帧
         if opcode == 0x08:
@@ -200,7 +262,7 @@ class VlessConnection:
     def __init__(self, sock, client, vless_header=None):
         self.sock = sock
         self.client = client
-        self.buffer = b''
+        self.buffer = bytearray()
         self.first_response = True
         self.vless_header = vless_header  # 第一次发送时需要带上
         self.first_send = True
@@ -214,24 +276,29 @@ class VlessConnection:
         else:
             self.client._send_ws_frame(self.sock, data)
     
+    def _recv_frame(self):
+        """接收一帧数据，第一个响应帧跳过 VLESS 响应头（版本 + 附加信息）"""
+        frame = self.client._recv_ws_frame(self.sock)
+        if frame and self.first_response and len(frame) >= 2:
+            addon_len = frame[1]
+            frame = frame[2 + addon_len:]
+            self.first_response = False
+        return frame
+    
     def recv(self, size):
         """接收数据"""
         # 如果缓冲区不够，尝试接收更多数据
         if len(self.buffer) < size:
             try:
-                frame = self.client._recv_ws_frame(self.sock)
+                frame = self._recv_frame()
                 if frame:
-                    # 第一个响应需要跳过 VLESS 响应头
-                    if self.first_response and len(frame) >= 2:
-                        addon_len = frame[1] if len(frame) > 1 else 0
-                        frame = frame[2 + addon_len:]
-                        self.first_response = False
                     self.buffer += frame
             except:
                 pass
         
-        result = self.buffer[:size]
-        self.buffer = self.buffer[size:]
+        # 从 bytearray 头部删除为原地操作，避免每次切片复制剩余数据
+        result = bytes(self.buffer[:size])
+        del self.buffer[:size]
         return result
     
     def recv_all(self):
@@ -240,23 +307,17 @@ class VlessConnection:
             self.sock.setblocking(False)
             while True:
                 try:
-                    frame = self.client._recv_ws_frame(self.sock)
+                    frame = self._recv_frame()
                     if frame is None:
                         break
-                    
-                    if self.first_response and len(frame) >= 2:
-                        addon_len = frame[1] if len(frame) > 1 else 0
-                        frame = frame[2 + addon_len:]
-                        self.first_response = False
-                    
                     self.buffer += frame
                 except (BlockingIOError, ssl.SSLWantReadError):
                     break
         finally:
             self.sock.setblocking(True)
         
-        result = self.buffer
-        self.buffer = b''
+        result = bytes(self.buffer)
+        self.buffer.clear()
         return result
     
     def close(self):
@@ -280,6 +341,8 @@ class LocalVlessProxy:
         """
         self.ws_url = ws_url
         self.vless_uuid = vless_uuid
+        # 所有连接共用同一个客户端，避免每个连接重复解析地址和 UUID
+        self.client = VlessClient(ws_url, vless_uuid)
         self.server = None
         self.thread = None
         self.port = None
@@ -370,8 +433,7 @@ class LocalVlessProxy:
         """处理 HTTPS CONNECT 请求"""
         try:
             # 连接到 VLESS
-            vless = VlessClient(self.ws_url, self.vless_uuid)
-            conn = vless.connect(host, port)
+            conn = self.client.connect(host, port)
             
             # 发送连接成功
             client.sendall(b'HTTP/1.1 200 Connection Established\r\n\r\n')
@@ -396,8 +458,7 @@ class LocalVlessProxy:
                 path += '?' + parsed.query
             
             # 连接到 VLESS
-            vless = VlessClient(self.ws_url, self.vless_uuid)
-            conn = vless.connect(host, port)
+            conn = self.client.connect(host, port)
             
             # 重建请求
             lines = original_request.split(b'\r\n')
@@ -422,15 +483,13 @@ class LocalVlessProxy:
             conn.send(request)
             
             # 读取响应并转发
-            self._relay_response(client, conn)
+            self._relay_response(client, conn, method)
             
         except Exception as e:
             client.sendall(b'HTTP/1.1 502 Bad Gateway\r\n\r\n')
     
     def _relay_bidirectional(self, client, conn):
         """双向数据转发（使用线程）"""
-        import threading
-        
         stop_event = threading.Event()
         
         def client_to_vless():
@@ -479,75 +538,57 @@ class LocalVlessProxy:
         conn.close()
     
     def _recv_ws_frame_safe(self, conn):
-        """安全地接收 WebSocket 帧"""
+        """安全地接收 WebSocket 帧（出错时返回空字节）"""
         try:
-            sock = conn.sock
-            header = sock.recv(2)
-            if len(header) < 2:
-                return None
-            
-            opcode = header[0] & 0x0F
-            masked = (header[1] & 0x80) != 0
-            length = header[1] & 0x7F
-            
-            if length == 126:
-                length_bytes = sock.recv(2)
-                length = struct.unpack('>H', length_bytes)[0]
-            elif length == 127:
-                length_bytes = sock.recv(8)
-                length = struct.unpack('>Q', length_bytes)[0]
-            
-            if masked:
-                mask = sock.recv(4)
-            
-            data = b''
-            while len(data) < length:
-                chunk = sock.recv(min(length - len(data), 8192))
-                if not chunk:
-                    break
-                data += chunk
-            
-            if masked:
-                data = bytes([data[i] ^ mask[i % 4] for i in range(len(data))])
-            
-            if opcode == 0x08:
-                return None
-            
-            # 跳过 VLESS 响应头
-            if conn.first_response and len(data) >= 2:
-                addon_len = data[1]
-                data = data[2 + addon_len:]
-                conn.first_response = False
-            
-            return data
+            return conn._recv_frame()
         except:
             return b''
     
-    def _relay_response(self, client, conn):
+    def _relay_response(self, client, conn, method='GET'):
         """转发 HTTP 响应"""
         try:
-            # 读取响应
             response = b''
             while True:
-                data = conn.recv(8192)
-                if not data:
-                    break
-                response += data
-                client.sendall(data)
+                # 读取响应头
+                while b'\r\n\r\n' not in response:
+                    # 先取完缓冲区已有数据，缓冲区为空时才等待新帧，
+                    # 避免响应头超过 8 KiB 且已整帧到达时仍阻塞等待
+                    data = conn.recv(len(conn.buffer) or 8192)
+                    if not data:
+                        return
+                    response += data
+                    client.sendall(data)
                 
-                # 检查是否完成
-                if b'\r\n\r\n' in response:
-                    # 简单处理：继续读取直到没有数据
-                    conn.sock.settimeout(0.5)
-                    try:
-                        while True:
-                            data = conn.recv(8192)
-                            if not data:
-                                break
-                            client.sendall(data)
-                    except socket.timeout:
-                        pass
+                head, _, response = response.partition(b'\r\n\r\n')
+                # 1xx 临时响应已随数据转发，继续解析其后的最终响应头
+                if not _is_interim_response(head):
                     break
+            
+            body = response
+            body_length = _response_body_length(head, method)
+            
+            if body_length is not None:
+                # 已知正文长度：读满即结束，无需等待超时
+                # （按剩余长度读取，避免缓冲区已有剩余数据时仍阻塞等待新帧）
+                received = len(body)
+                while received < body_length:
+                    data = conn.recv(min(8192, body_length - received))
+                    if not data:
+                        break
+                    received += len(data)
+                    client.sendall(data)
+                return
+            
+            # 长度未知（chunked 或以关闭连接结束）：继续读取直到没有数据
+            conn.sock.settimeout(0.5)
+            try:
+                while True:
+                    data = conn.recv(8192)
+                    if not data:
+                        break
+                    client.sendall(data)
+            except socket.timeout:
+                pass
         finally:
             conn.close()
     
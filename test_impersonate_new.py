@@ -4,6 +4,8 @@
 import sys
 sys.path.insert(0, '.')
 
+from concurrent.futures import ThreadPoolExecutor
+
 import cfspider
 
 CF_WORKERS = "https://ip.kami666.xyz"
@@ -82,12 +84,18 @@ def test_different_browsers():
     
     browsers = ["chrome131", "safari18_0", "firefox133"]
     
+    def fetch(browser):
+        return cfspider.get(
+            "https://tls.browserleaks.com/json",
+            impersonate=browser
+        )
+    
     try:
-        for browser in browsers:
-            response = cfspider.get(
-                "https://tls.browserleaks.com/json",
-                impersonate=browser
-            )
+        # 三个请求互不依赖，并发发送；结果按 browsers 顺序输出
+        with ThreadPoolExecutor(max_workers=len(browsers)) as executor:
+            responses = list(executor.map(fetch, browsers))
+        
+        for browser, response in zip(browsers, responses):
             data = response.json()
             print(f"{browser}: JA3={data.get('ja3_hash', 'N/A')[:16]}...")
         